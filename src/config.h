@@ -8,6 +8,7 @@
 // Display settings
 #define DISPLAY_WIDTH 240
 #define DISPLAY_HEIGHT 240
+#define DISPLAY_SELF_TEST 0  // 1 = show color/backlight test pattern at boot (adds ~2.5s)
 
 // WiFi settings
 #define WIFI_AP_NAME "SmartClock-Setup"
@@ -38,6 +39,11 @@
 #define BUTTON_SHORT_PRESS_MAX_MS 800
 #define BUTTON_LONG_PRESS_MIN_MS 2000
 
+// Settings defaults (factory reset)
+#define DEFAULT_BRIGHTNESS 70
+#define DEFAULT_THEME 0
+#define DEFAULT_GMT_OFFSET 3600  // +1 hour (CET)
+
 // Filesystem
 #define IMAGE_DIR "/image/"
 
@@ -5,6 +5,7 @@
 #include <TJpg_Decoder.h>
 #include <ESP8266WiFi.h>
 #include <vector>
+#include <iterator>
 #include <time.h> // For time and date functions
 
 // Font size definitions for clarity
@@ -17,6 +18,22 @@ TFT_eSPI tft = TFT_eSPI();
 DisplayState displayState;
 int scrollPos = 240;
 
+// Contents of the clock page as last drawn, used for selective redraw
+static PreviousDisplayState prevState;
+
+// Set when the screen was drawn over outside the page renderers (messages,
+// blanking), so the next displayUpdate() must discard prevState and redraw.
+static bool screenInvalidated = false;
+
+// True while the AP credentials screen is on the panel; reset on full redraw
+static bool apScreenDrawn = false;
+
+// Wrapped lines of the clock page texts, re-wrapped only when the text changes
+static std::vector<String> clockIpLines;
+static std::vector<String> clockTimeLines;
+static std::vector<String> clockDateLines;
+static std::vector<String> clockMessageLines;
+
 bool tft_output(int16_t x, int16_t y, uint16_t w, uint16_t h, uint16_t* bitmap) {
     if (y >= tft.height()) return 0;
     tft.pushImage(x, y, w, h, bitmap);
@@ -24,7 +41,10 @@ bool tft_output(int16_t x, int16_t y, uint16_t w, uint16_t h, uint16_t* bitmap)
 }
 
 // Helper function to wrap text
-std::vector<String> wrapText(String text, int font, int maxWidth) {
+// Built-in TFT_eSPI fonts have no kerning, so a line's width is the sum of its
+// words' widths. Each word is measured once and the line width is tracked
+// incrementally instead of re-measuring the whole line for every word.
+std::vector<String> wrapText(const String &text, int font, int maxWidth) {
     std::vector<String> lines;
     if (text.isEmpty()) {
         lines.push_back("");
@@ -33,31 +53,39 @@ std::vector<String> wrapText(String text, int font, int maxWidth) {
 
     // Set the font for text width calculations
     tft.setTextFont(font);
+    int spaceWidth = tft.textWidth(" ");
 
     String currentLine = "";
     String word = "";
+    int lineWidth = 0;
     // Temporarily increase buffer size to handle longer lines during word accumulation
-    currentLine.reserve(text.length() + 10); 
-        word.reserve(text.length() + 10); 
-    
-        for (size_t i = 0; i < text.length(); i++) {
-            char c = text.charAt(i);
-            if (c == ' ') {            // Check if adding the word exceeds maxWidth
-            if (tft.textWidth(currentLine + word) > maxWidth) { // Use textWidth with current font set
+    currentLine.reserve(text.length() + 10);
+    word.reserve(text.length() + 10);
+
+    for (size_t i = 0; i < text.length(); i++) {
+        char c = text.charAt(i);
+        if (c == ' ') {
+            // Check if adding the word exceeds maxWidth
+            int wordWidth = tft.textWidth(word);
+            if (lineWidth + wordWidth > maxWidth) {
                 // If current line is not empty, add it and start a new line with the word
                 if (!currentLine.isEmpty()) {
                     lines.push_back(currentLine);
                     currentLine = word; // Start new line with the current word
+                    lineWidth = wordWidth;
                 } else {
                     // Word itself is longer than maxWidth, force break within word if needed
                     // For simplicity, for now just add the too-long word on its own line
                     lines.push_back(word);
                     currentLine = "";
+                    lineWidth = 0;
                 }
             } else {
                 currentLine += word;
+                lineWidth += wordWidth;
             }
             currentLine += " "; // Add space after word
+            lineWidth += spaceWidth;
             word = "";
         } else {
             word += c;
@@ -66,7 +94,7 @@ std::vector<String> wrapText(String text, int font, int maxWidth) {
 
     // Add the last word/part of word
     if (!word.isEmpty()) {
-        if (tft.textWidth(currentLine + word) > maxWidth) { // Use textWidth with current font set
+        if (lineWidth + tft.textWidth(word) > maxWidth) {
             if (!currentLine.isEmpty()) {
                 lines.push_back(currentLine);
             }
@@ -102,6 +130,7 @@ void displayInit() {
     tft.setRotation(0);
     tft.invertDisplay(true);  // Match ESPHome invert_colors: true
 
+#if DISPLAY_SELF_TEST
     logPrint(F("Display initialized, testing colors..."));
 
     // Test: fill screen with colors
@@ -113,6 +142,7 @@ void displayInit() {
     delay(500);
     tft.fillScreen(TFT_WHITE);
     delay(500);
+#endif
     tft.fillScreen(TFT_BLACK);
 
     // Test text
@@ -138,10 +168,12 @@ void displayInit() {
     analogWriteFreq(1000);            // Zet PWM frequency
     analogWriteRange(1023);           // 10bit
 
-    // Test: first full brightness
-    logPrint(F("Testing backlight..."));
+    // Start at full brightness
     analogWrite(PIN_BACKLIGHT, 0);    // Inverted: 0 = full bright
+#if DISPLAY_SELF_TEST
+    logPrint(F("Testing backlight..."));
     delay(500);
+#endif
 
     logPrint(F("Display init complete"));
 }
@@ -151,16 +183,8 @@ void displaySetBrightness(int brightness) {
 
     // ESP8266 PWM range is 0-1023
     // Hardware is inverted: LOW = bright, HIGH = off
-    int pwmValue;
-
-    if (brightness == 0) {
-        pwmValue = 1023;  // Off
-    } else if (brightness == 100) {
-        pwmValue = 0;     // Full bright
-    } else {
-        // Map 1-99 to 1023-0 (inverted)
-        pwmValue = map(brightness, 0, 100, 1023, 0);
-    }
+    // Map 0-100 to 1023-0 with rounding: 0 gives exactly 1023 (off), 100 gives 0 (full bright)
+    int pwmValue = ((100 - brightness) * 1023 + 50) / 100;
 
     analogWrite(PIN_BACKLIGHT, pwmValue);
     logPrintf("Brightness: %d%%, PWM: %d", brightness, pwmValue);
@@ -174,37 +198,33 @@ int getWiFiSignalPercent() {
 }
 
 void displayUpdate() {
-    logPrint(F("displayUpdate() called"));
-
     // Track last mode to reset state on mode change (eliminate flickering)
     static uint8_t lastMode = 0; // 0=clock, 1=ap, 2=image
     uint8_t currentMode = (displayState.showImage && displayState.imagePath[0] != '\0') ? 2 : (displayState.apMode ? 1 : 0);
 
-    // On mode change, force full redraw
-    if (currentMode != lastMode) {
-        tft.fillScreen(TFT_BLACK);
+    // On mode change or after the screen was drawn over, force full redraw
+    if (currentMode != lastMode || screenInvalidated) {
+        // The clock page clears the screen itself once prevState is reset
+        if (currentMode != 0) {
+            tft.fillScreen(TFT_BLACK);
+        }
         lastMode = currentMode;
+        screenInvalidated = false;
+        memset(&prevState, 0, sizeof(prevState));
+        apScreenDrawn = false;
     }
 
     if (displayState.showImage && displayState.imagePath[0] != '\0') {
-        logPrint(String(F("Rendering image: ")) + displayState.imagePath);
+        logPrintf("Rendering image: %s", displayState.imagePath);
         displayRenderImage((const char*)displayState.imagePath);
     } else if (displayState.apMode) {
-        logPrint(F("Rendering AP mode screen"));
         displayRenderAPMode();
     } else {
-        logPrint(F("Rendering clock"));
         displayRenderClock();
     }
-    logPrint(F("displayUpdate() done"));
 }
 
 void displayRenderClock() {
-    logPrint(F("displayRenderClock START (Simplified)"));
-
-    // Track previous state to avoid flickering
-    static PreviousDisplayState prevState = {0};
-
     // Check if layout changed (IP appeared/disappeared)
     bool hadIP = prevState.ipInfo[0] != '\0';
     bool hasIP = displayState.ipInfo[0] != '\0';
@@ -230,18 +250,18 @@ void displayRenderClock() {
         int ipFont = FONT_INFO; // Small font
         tft.setTextFont(ipFont);
         int ipLineHeight = tft.fontHeight();
-        std::vector<String> ipWrappedLines = wrapText(String(displayState.ipInfo), ipFont, tft.width() - 10);
-
         if (ipChanged || !prevState.initialized) {
+            clockIpLines = wrapText(String(displayState.ipInfo), ipFont, tft.width() - 10);
+
             // Clear previous IP area
-            tft.fillRect(0, currentY, tft.width(), ipWrappedLines.size() * ipLineHeight, TFT_BLACK);
+            tft.fillRect(0, currentY, tft.width(), clockIpLines.size() * ipLineHeight, TFT_BLACK);
 
-            for (size_t i = 0; i < ipWrappedLines.size(); i++) {
-                tft.drawString(ipWrappedLines[i], tft.width() / 2, currentY + (i * ipLineHeight), ipFont);
+            for (size_t i = 0; i < clockIpLines.size(); i++) {
+                tft.drawString(clockIpLines[i], tft.width() / 2, currentY + (i * ipLineHeight), ipFont);
             }
             strncpy(prevState.ipInfo, displayState.ipInfo, sizeof(prevState.ipInfo) - 1);
         }
-        currentY += ipWrappedLines.size() * ipLineHeight + 10; // Add spacing after IP
+        currentY += clockIpLines.size() * ipLineHeight + 10; // Add spacing after IP
     }
 
     // Check if time or date changed
@@ -249,6 +269,8 @@ void displayRenderClock() {
     char currentDate[16];
     getFormattedDate(currentDate, sizeof(currentDate));
     bool dateChanged = strcmp(currentDate, prevState.date) != 0;
+    bool redrawTime = timeChanged || !prevState.initialized;
+    bool redrawDate = dateChanged || !prevState.initialized;
 
     // Display Time (displayState.line1) - Centered
     tft.setTextColor(TFT_WHITE, TFT_BLACK);
@@ -256,18 +278,22 @@ void displayRenderClock() {
     int timeFont = FONT_TIME;
     tft.setTextFont(timeFont);
     int timeLineHeight = tft.fontHeight();
-    std::vector<String> timeWrappedLines = wrapText(String(displayState.line1), timeFont, tft.width());
+    if (redrawTime) {
+        clockTimeLines = wrapText(String(displayState.line1), timeFont, tft.width());
+    }
 
     // Calculate remaining space and center time vertically in it
     int remainingHeight = tft.height() - currentY;
-    int totalTextHeight = timeWrappedLines.size() * timeLineHeight;
+    int totalTextHeight = clockTimeLines.size() * timeLineHeight;
 
     // Add date height to calculation
     int dateFont = FONT_DEFAULT;
     tft.setTextFont(dateFont);
     int dateLineHeight = tft.fontHeight();
-    std::vector<String> dateWrappedLines = wrapText(String(currentDate), dateFont, tft.width());
-    int totalDateHeight = dateWrappedLines.size() * dateLineHeight;
+    if (redrawDate) {
+        clockDateLines = wrapText(String(currentDate), dateFont, tft.width());
+    }
+    int totalDateHeight = clockDateLines.size() * dateLineHeight;
 
     // Center the time+date block in remaining space
     int timeBlockHeight = totalTextHeight + (timeLineHeight / 2) + totalDateHeight;
@@ -275,14 +301,16 @@ void displayRenderClock() {
     currentY = timeStartY;
 
     // Draw time - only if changed
-    if (timeChanged || !prevState.initialized) {
+    if (redrawTime) {
         tft.setTextFont(timeFont);
-        // Clear time area
-        tft.fillRect(0, currentY, tft.width(), totalTextHeight, TFT_BLACK);
+        // Pad each line to full width so the old time is overwritten in the same
+        // pass, instead of clearing the whole block first (avoids flicker each second)
+        tft.setTextPadding(tft.width());
 
-        for (size_t i = 0; i < timeWrappedLines.size(); i++) {
-            tft.drawString(timeWrappedLines[i], tft.width() / 2, currentY + (i * timeLineHeight), timeFont);
+        for (size_t i = 0; i < clockTimeLines.size(); i++) {
+            tft.drawString(clockTimeLines[i], tft.width() / 2, currentY + (i * timeLineHeight), timeFont);
         }
+        tft.setTextPadding(0);
         strncpy(prevState.line1, displayState.line1, sizeof(prevState.line1) - 1);
     }
     currentY += totalTextHeight; // Move Y past the time block
@@ -291,13 +319,13 @@ void displayRenderClock() {
     currentY += timeLineHeight / 2; // Roughly half a line height padding
 
     // Display Date (getFormattedDate()) - Centered, below time - only if changed
-    if (dateChanged || !prevState.initialized) {
+    if (redrawDate) {
         tft.setTextFont(dateFont);
         // Clear date area
         tft.fillRect(0, currentY, tft.width(), totalDateHeight, TFT_BLACK);
 
-        for (size_t i = 0; i < dateWrappedLines.size(); i++) {
-            tft.drawString(dateWrappedLines[i], tft.width() / 2, currentY + (i * dateLineHeight), dateFont);
+        for (size_t i = 0; i < clockDateLines.size(); i++) {
+            tft.drawString(clockDateLines[i], tft.width() / 2, currentY + (i * dateLineHeight), dateFont);
         }
         strncpy(prevState.date, currentDate, sizeof(prevState.date) - 1);
     }
@@ -309,17 +337,20 @@ void displayRenderClock() {
         int messageFont = FONT_MESSAGE; // Smaller font for messages
         tft.setTextFont(messageFont);
         int messageLineHeight = tft.fontHeight();
-        std::vector<String> messageWrappedLines = wrapText(String(displayState.line2), messageFont, tft.width());
+        bool redrawMessage = messageChanged || !prevState.initialized;
+        if (redrawMessage) {
+            clockMessageLines = wrapText(String(displayState.line2), messageFont, tft.width());
+        }
 
         // Add some padding between date and message
         currentY += messageLineHeight / 2;
 
-        if (messageChanged || !prevState.initialized) {
+        if (redrawMessage) {
             // Clear message area (might need to clear previous if longer)
-            tft.fillRect(0, currentY, tft.width(), messageWrappedLines.size() * messageLineHeight + 10, TFT_BLACK);
+            tft.fillRect(0, currentY, tft.width(), clockMessageLines.size() * messageLineHeight + 10, TFT_BLACK);
 
-            for (size_t i = 0; i < messageWrappedLines.size(); i++) {
-                tft.drawString(messageWrappedLines[i], tft.width() / 2, currentY + (i * messageLineHeight), messageFont);
+            for (size_t i = 0; i < clockMessageLines.size(); i++) {
+                tft.drawString(clockMessageLines[i], tft.width() / 2, currentY + (i * messageLineHeight), messageFont);
             }
             strncpy(prevState.line2, displayState.line2, sizeof(prevState.line2) - 1);
         }
@@ -332,18 +363,24 @@ void displayRenderClock() {
         tft.fillRect(0, currentY, tft.width(), messageLineHeight * 3, TFT_BLACK);
         prevState.line2[0] = '\0';
     }
-
-    logPrint(F("displayRenderClock DONE (Simplified)"));
 }
 
 void displayRenderAPMode() {
-    logPrint(F("displayRenderAPMode START"));
+    // Credentials as last drawn; skip the redraw while they are unchanged
+    static char shownSSID[DISPLAY_SSID_BUFFER_SIZE];
+    static char shownPassword[DISPLAY_PASS_BUFFER_SIZE];
+    static char shownIP[DISPLAY_IP_BUFFER_SIZE];
+    if (apScreenDrawn &&
+        strcmp(shownSSID, displayState.apSSID) == 0 &&
+        strcmp(shownPassword, displayState.apPassword) == 0 &&
+        strcmp(shownIP, displayState.ipInfo) == 0) {
+        return;
+    }
 
-    // Only clear screen on mode change
-    static bool apModeRendered = false;
-    if (!apModeRendered) {
+    // Screen is cleared by displayUpdate() on mode change; clear here only
+    // when the credentials changed while the AP screen was already shown
+    if (apScreenDrawn) {
         tft.fillScreen(TFT_BLACK);
-        apModeRendered = true;
     }
 
     int currentY = 5; // Start from top with small margin
@@ -426,25 +463,24 @@ void displayRenderAPMode() {
         tft.drawString(passwordWrappedLines[i], tft.width() / 2, passwordLineY + (i * valueHeight), valueFont);
     }
 
-    logPrint(F("displayRenderAPMode DONE"));
+    strncpy(shownSSID, displayState.apSSID, sizeof(shownSSID) - 1);
+    strncpy(shownPassword, displayState.apPassword, sizeof(shownPassword) - 1);
+    strncpy(shownIP, displayState.ipInfo, sizeof(shownIP) - 1);
+    apScreenDrawn = true;
 }
 
 void displayBlankScreen() {
     tft.fillScreen(TFT_BLACK);
+    screenInvalidated = true;
     logPrint(F("Display blanked to black."));
 }
 
 void displayRenderImage(const char *path) {
-    if (!LittleFS.exists(path)) {
-        displayShowMessage(F("Image not found"));
-        return;
-    }
-
+    // Open directly; a separate exists() check would walk the path twice
     File jpgFile = LittleFS.open(path, "r");
     if (!jpgFile) {
-        String errorMsg = String(F("Failed to open image file: ")) + path;
-        displayShowMessage(errorMsg);
-        logPrint(errorMsg);
+        displayShowMessage(F("Image not found"));
+        logPrintf("Failed to open image file: %s", path);
         return;
     }
     logPrint(String(F("INFO: Image file opened: ")) + path);
@@ -466,6 +502,7 @@ void displayRenderImage(const char *path) {
 
 void displayShowMessage(const String &msg) {
     tft.fillScreen(TFT_BLACK); // Re-added for previous behavior
+    screenInvalidated = true;
     tft.setTextColor(TFT_WHITE, TFT_BLACK);
     tft.setTextDatum(MC_DATUM);
 
@@ -476,21 +513,20 @@ void displayShowMessage(const String &msg) {
     tft.setTextFont(font); // Set font for height calculation
     int lineHeight = tft.fontHeight();
 
-    // Split message by newline characters first
-    std::vector<String> linesToProcess;
-    int prev = 0;
-    for (size_t i = 0; i < msg.length(); i++) {
-        if (msg.charAt(i) == '\n') {
-            linesToProcess.push_back(msg.substring(prev, i));
-            prev = i + 1;
-        }
-    }
-    linesToProcess.push_back(msg.substring(prev)); // Add the last part
-
+    // Split message on newlines and wrap each part straight into the output list
     std::vector<String> finalWrappedLines;
-    for (size_t i = 0; i < linesToProcess.size(); i++) {
-        std::vector<String> wrapped = wrapText(linesToProcess[i], font, tft.width());
-        finalWrappedLines.insert(finalWrappedLines.end(), wrapped.begin(), wrapped.end());
+    int start = 0;
+    while (true) {
+        int end = msg.indexOf('\n', start);
+        String segment = end < 0 ? msg.substring(start) : msg.substring(start, end);
+        std::vector<String> wrapped = wrapText(segment, font, tft.width());
+        finalWrappedLines.insert(finalWrappedLines.end(),
+                                 std::make_move_iterator(wrapped.begin()),
+                                 std::make_move_iterator(wrapped.end()));
+        if (end < 0) {
+            break;
+        }
+        start = end + 1;
     }
     
     // Adjust startY to vertically center the block of text
@@ -10,6 +10,14 @@ void loggerInit() {
     logCount = 0;
 }
 
+// Move to the next ring buffer slot after logBuffer[logIndex] was filled
+static void logAdvance() {
+    logIndex = (logIndex + 1) % LOG_BUFFER_SIZE;
+    if (logCount < LOG_BUFFER_SIZE) {
+        logCount++;
+    }
+}
+
 void logPrint(const String &msg) {
     // Print to serial
     Serial.println(msg);
@@ -18,20 +26,29 @@ void logPrint(const String &msg) {
     strncpy(logBuffer[logIndex], msg.c_str(), LOG_LINE_LENGTH - 1);
     logBuffer[logIndex][LOG_LINE_LENGTH - 1] = '\0';
 
-    logIndex = (logIndex + 1) % LOG_BUFFER_SIZE;
-    if (logCount < LOG_BUFFER_SIZE) {
-        logCount++;
-    }
+    logAdvance();
+}
+
+// Fast path for F() literals: copy from flash into the slot without a temporary String
+void logPrint(const __FlashStringHelper *msg) {
+    char *line = logBuffer[logIndex];
+    strncpy_P(line, (PGM_P)msg, LOG_LINE_LENGTH - 1);
+    line[LOG_LINE_LENGTH - 1] = '\0';
+
+    Serial.println(line);
+    logAdvance();
 }
 
 void logPrintf(const char* format, ...) {
-    char buffer[LOG_LINE_LENGTH];
+    // Format straight into the next buffer slot, no intermediate String
+    char *line = logBuffer[logIndex];
     va_list args;
     va_start(args, format);
-    vsnprintf(buffer, LOG_LINE_LENGTH, format, args);
+    vsnprintf(line, LOG_LINE_LENGTH, format, args);
     va_end(args);
 
-    logPrint(String(buffer));
+    Serial.println(line);
+    logAdvance();
 }
 
 String logGetAll() {
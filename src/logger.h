@@ -8,6 +8,7 @@
 
 void loggerInit();
 void logPrint(const String &msg);
+void logPrint(const __FlashStringHelper *msg);
 void logPrintf(const char* format, ...);
 String logGetAll();
 
@@ -19,7 +19,7 @@
 // Define NTP Client
 Settings appSettings;
 WiFiUDP ntpUDP;
-NTPClient timeClient(ntpUDP, NTP_SERVER, appSettings.gmtOffset);
+NTPClient timeClient(ntpUDP, NTP_SERVER);  // Offset applied in setup() once settings are loaded
 WiFiManager wifiManager;
 unsigned long lastDisplayUpdate = 0;
 unsigned long lastWiFiCheck = 0;
@@ -116,6 +116,16 @@ bool tryConnectWiFi(int maxAttempts) {
 
         
 
+// Report the failsafe AP credentials on Serial and the display
+void reportFailsafeAP() {
+    String apIP = WiFi.softAPIP().toString();
+    Serial.printf("Failsafe AP started\n");
+    Serial.printf("  SSID: %s\n", WIFI_AP_NAME);
+    Serial.printf("  Password: %s\n", apPassword.c_str());
+    Serial.printf("  IP: %s\n", apIP.c_str());
+    displayShowAPScreen(WIFI_AP_NAME, apPassword.c_str(), apIP.c_str());
+}
+
         void setupWiFi() {
 
             displayShowMessage(F("WiFi Setup..."));
@@ -290,17 +300,7 @@ bool tryConnectWiFi(int maxAttempts) {
 
         
 
-                Serial.printf("Failsafe AP started\n");
-
-                Serial.printf("  SSID: %s\n", WIFI_AP_NAME);
-
-                Serial.printf("  Password: %s\n", apPassword.c_str());
-
-                Serial.printf("  IP: %s\n", WiFi.softAPIP().toString().c_str());
-
-                displayBlankScreen(); // Blank screen before showing AP credentials
-        
-                displayShowAPScreen(WIFI_AP_NAME, apPassword.c_str(), WiFi.softAPIP().toString().c_str());
+                reportFailsafeAP();
 
                 delay(5000);
 
@@ -314,12 +314,14 @@ bool tryConnectWiFi(int maxAttempts) {
 void monitorWiFi() {
     // In failsafe mode, periodically try to reconnect to WiFi (only if credentials are saved)
     if (wifiFailsafeMode) {
-        // Only attempt reconnection if WiFi credentials are actually saved
-        String ssid = WiFi.SSID();
-        if (!ssid.isEmpty() && ssid.length() > 0) {
-            if (millis() - lastWiFiReconnectAttempt > WIFI_RECONNECT_INTERVAL) {
+        // Check the interval first: WiFi.SSID() allocates a String on every call
+        if (millis() - lastWiFiReconnectAttempt > WIFI_RECONNECT_INTERVAL) {
+            lastWiFiReconnectAttempt = millis();
+
+            // Only attempt reconnection if WiFi credentials are actually saved
+            String ssid = WiFi.SSID();
+            if (!ssid.isEmpty()) {
                 Serial.println(F("Failsafe mode: attempting WiFi reconnection..."));
-                lastWiFiReconnectAttempt = millis();
 
                 if (tryConnectWiFi(2)) {  // Quick 2 attempts
                     wifiFailsafeMode = false;
@@ -347,14 +349,7 @@ void monitorWiFi() {
                 WiFi.softAP(WIFI_AP_NAME, apPassword.c_str());
                 wifiFailsafeMode = true;
 
-                Serial.printf("Failsafe AP started\n");
-                Serial.printf("  SSID: %s\n", WIFI_AP_NAME);
-                Serial.printf("  Password: %s\n", apPassword.c_str());
-                Serial.printf("  IP: %s\n", WiFi.softAPIP().toString().c_str());
-
-                displayBlankScreen(); // Blank screen before showing AP credentials
-                // Set AP mode display state
-                displayShowAPScreen(WIFI_AP_NAME, apPassword.c_str(), WiFi.softAPIP().toString().c_str());
+                reportFailsafeAP();
                 delay(3000);
             }
         }
@@ -375,6 +370,10 @@ void setupMDNS() {
     Serial.println(F("mDNS started: " MDNS_HOSTNAME ".local"));
 }
 
+// OTA progress bar state, reset at the start of every transfer
+static int otaLastPercent = -1;
+static int otaLastBarWidth = 0;
+
 void setupOTA() {
     ArduinoOTA.setHostname(OTA_HOSTNAME);
     ArduinoOTA.setPassword(OTA_PASSWORD);
@@ -383,6 +382,8 @@ void setupOTA() {
         String type = (ArduinoOTA.getCommand() == U_FLASH) ? "firmware" : "filesystem";
         Serial.println("OTA Start: " + type);
         displayShowMessage(F("OTA Update..."));
+        otaLastPercent = -1;
+        otaLastBarWidth = 0;
     });
 
     ArduinoOTA.onEnd([]() {
@@ -394,12 +395,17 @@ void setupOTA() {
         int percent = (progress * 100) / total;
         Serial.printf("Progress: %u%%\n", percent);
 
-        static int lastPercent = -1;
-        if (percent != lastPercent) {
-            tft.fillRect(20, 130, 200, 20, TFT_BLACK);
-            tft.drawRect(20, 130, 200, 20, TFT_WHITE);
-            tft.fillRect(22, 132, (percent * 196) / 100, 16, TFT_BLUE);
-            lastPercent = percent;
+        if (percent != otaLastPercent) {
+            int barWidth = (percent * 196) / 100;
+            if (otaLastPercent < 0) {
+                // First update of this transfer: draw the empty frame once
+                tft.fillRect(20, 130, 200, 20, TFT_BLACK);
+                tft.drawRect(20, 130, 200, 20, TFT_WHITE);
+            }
+            // Only fill the part of the bar that grew since the last update
+            tft.fillRect(22 + otaLastBarWidth, 132, barWidth - otaLastBarWidth, 16, TFT_BLUE);
+            otaLastBarWidth = barWidth;
+            otaLastPercent = percent;
         }
     });
 
@@ -638,6 +644,8 @@ void setup() {
 
     if (!wifiFailsafeMode) {
 
+        timeClient.setTimeOffset(appSettings.gmtOffset);
+
         timeClient.begin();
 
         logPrint(F("NTP: Initializing time synchronization using NTPClient..."));
@@ -746,6 +754,30 @@ void setup() {
 
 
 
+// Copy current time/network info into displayState.
+// Only called right before a render, so the strings aren't rebuilt on every loop pass.
+void refreshDisplayState() {
+    if (!wifiFailsafeMode) {
+        displayState.apMode = false;  // Ensure AP mode is disabled in normal mode
+        // Format HH:MM:SS straight into the buffer (getFormattedTime() builds several Strings)
+        unsigned long epoch = timeClient.getEpochTime();
+        snprintf(displayState.line1, sizeof(displayState.line1), "%02lu:%02lu:%02lu",
+                 (epoch % 86400L) / 3600, (epoch % 3600) / 60, epoch % 60);
+        strncpy(displayState.ipInfo, WiFi.localIP().toString().c_str(), sizeof(displayState.ipInfo));
+        displayState.ipInfo[sizeof(displayState.ipInfo) - 1] = '\0';
+        displayState.line2[0] = '\0';  // Clear custom message in normal mode
+    } else {
+        // In failsafe mode, show AP credentials on display
+        displayState.apMode = true;
+        strncpy(displayState.apSSID, WIFI_AP_NAME, sizeof(displayState.apSSID));
+        displayState.apSSID[sizeof(displayState.apSSID) - 1] = '\0';
+        strncpy(displayState.apPassword, apPassword.c_str(), sizeof(displayState.apPassword));
+        displayState.apPassword[sizeof(displayState.apPassword) - 1] = '\0';
+        strncpy(displayState.ipInfo, WiFi.softAPIP().toString().c_str(), sizeof(displayState.ipInfo));
+        displayState.ipInfo[sizeof(displayState.ipInfo) - 1] = '\0';
+    }
+}
+
 void loop() {
 
     // Reset power cycle counter after 10 seconds of successful uptime
@@ -781,33 +813,13 @@ void loop() {
         ArduinoOTA.handle();
         MDNS.update();
         timeClient.update(); // Keep NTP client updated
-
-        // Only update time if not showing an image
-        if (!displayState.showImage) {
-            displayState.apMode = false;  // Ensure AP mode is disabled in normal mode
-            strncpy(displayState.line1, timeClient.getFormattedTime().c_str(), sizeof(displayState.line1));
-            displayState.line1[sizeof(displayState.line1) - 1] = '\0';
-            strncpy(displayState.ipInfo, WiFi.localIP().toString().c_str(), sizeof(displayState.ipInfo));
-            displayState.ipInfo[sizeof(displayState.ipInfo) - 1] = '\0';
-            displayState.line2[0] = '\0';  // Clear custom message in normal mode
-        }
-    } else {
-        // In failsafe mode, show AP credentials on display
-        if (!displayState.showImage) {
-            displayState.apMode = true;
-            strncpy(displayState.apSSID, WIFI_AP_NAME, sizeof(displayState.apSSID));
-            displayState.apSSID[sizeof(displayState.apSSID) - 1] = '\0';
-            strncpy(displayState.apPassword, apPassword.c_str(), sizeof(displayState.apPassword));
-            displayState.apPassword[sizeof(displayState.apPassword) - 1] = '\0';
-            strncpy(displayState.ipInfo, WiFi.softAPIP().toString().c_str(), sizeof(displayState.ipInfo));
-            displayState.ipInfo[sizeof(displayState.ipInfo) - 1] = '\0';
-        }
     }
 
     webserverHandle();
 
     if (millis() - lastDisplayUpdate > DISPLAY_UPDATE_INTERVAL) {
         if (!displayState.showImage) {
+            refreshDisplayState();
             displayUpdate();
         }
         lastDisplayUpdate = millis();
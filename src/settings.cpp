@@ -1,4 +1,5 @@
 #include "settings.h"
+#include "config.h"
 
 #define EEPROM_SIZE 512
 #define SETTINGS_MAGIC 0xCAFE
@@ -73,10 +74,10 @@ void settingsReset(Settings &settings) {
     Serial.println(F("Resetting settings to factory defaults"));
 
     settings.version = FIRMWARE_VERSION;
-    settings.brightness = 70;
-    settings.theme = 0;
+    settings.brightness = DEFAULT_BRIGHTNESS;
+    settings.theme = DEFAULT_THEME;
     settings.lastImage[0] = '\0';
-    settings.gmtOffset = 3600;      // Default to +1 hour (CET)
+    settings.gmtOffset = DEFAULT_GMT_OFFSET;
     settings.valid = true;
     settings.crc = settingsCalculateCRC(settings);
 }
@@ -11,8 +11,8 @@
 
 ESP8266WebServer server(WEB_SERVER_PORT);
 
-int currentBrightness = 70;
-int currentTheme = 0;
+int currentBrightness = DEFAULT_BRIGHTNESS;
+int currentTheme = DEFAULT_THEME;
 char currentImage[DISPLAY_PATH_BUFFER_SIZE];
 
 extern Settings appSettings;
@@ -20,17 +20,12 @@ extern Settings appSettings;
 // File upload buffer
 File uploadFile;
 
-const char* index_html = R"rawliteral(<!DOCTYPE html><html><head><title>SmartClock Control</title><meta name="viewport" content="width=device-width, initial-scale=1"><style>:root{--primary-color:#007bff;--primary-hover-color:#0056b3;--danger-color:#dc3545;--danger-hover-color:#c82333;--background-color:#f8f9fa;--card-bg-color:#ffffff;--border-color:#dee2e6;--text-color:#212529;--light-text-color:#6c757d;--shadow-color:rgba(0,0,0,0.05);--font-family:-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif}body{font-family:var(--font-family);margin:0;padding:20px;background-color:var(--background-color);color:var(--text-color);line-height:1.5}.container{max-width:600px;margin:20px auto;background-color:var(--card-bg-color);border-radius:8px;box-shadow:0 4px 12px var(--shadow-color);overflow:hidden}h1{background-color:var(--primary-color);color:white;padding:15px 20px;margin:0;font-size:1.8em;text-align:center;border-bottom:1px solid var(--primary-hover-color)}.card{background-color:var(--card-bg-color);border:1px solid var(--border-color);border-radius:8px;margin:20px;overflow:hidden;box-shadow:0 2px 5px var(--shadow-color)}.card-header{background-color:#e9ecef;padding:10px 15px;font-size:1.2em;font-weight:bold;color:var(--primary-color);border-bottom:1px solid var(--border-color)}.card-body{padding:15px}.input-group{margin-bottom:15px}.input-group label{display:block;margin-bottom:5px;font-weight:bold;color:var(--text-color)}.input-group input[type="number"],.input-group input[type="text"],.input-group input[type="password"],.input-group select{width:calc(100% - 22px);padding:10px;border:1px solid var(--border-color);border-radius:4px;box-sizing:border-box;font-size:1em;margin-top:3px}.input-group input[type="file"]{margin-top:5px}.button{display:inline-block;background-color:var(--primary-color);color:white;padding:10px 15px;border:none;border-radius:5px;cursor:pointer;text-decoration:none;font-size:1em;margin-top:10px;transition:background-color 0.2s ease}.button:hover{background-color:var(--primary-hover-color)}.button.red{background-color:var(--danger-color)}.button.red:hover{background-color:var(--danger-hover-color)}.button-group{display:flex;flex-wrap:wrap;gap:10px;margin-top:10px}.button-group .button{margin-top:0}.info{background-color:#e0f7fa;color:#006064;border:1px solid #b2ebf2;padding:10px;border-radius:5px;margin-top:15px;font-size:0.9em}.version-info{background-color:#f8f9fa;color:#495057;padding:8px 10px;border-radius:4px;margin-bottom:15px;font-size:0.9em;text-align:center}#scanStatus{margin-top:10px;font-style:italic;color:var(--light-text-color)}form{margin-bottom:0}.spacer{height:10px}</style></head><body><div class="container"><h1>SmartClock Control</h1><div class="card"><div class="card-header">Status & Info</div><div class="card-body"><div class="version-info">Firmware Version: <strong id="firmwareVersion">Loading...</strong></div><div class="button-group"><a href="/app.json" class="button">App JSON</a><a href="/space.json" class="button">Storage Info</a><a href="/brt.json" class="button">Brightness JSON</a><a href="/log" class="button">View Logs</a></div></div></div><div class="card"><div class="card-header">WiFi Configuration</div><div class="card-body"><button class="button" onclick="scanWiFi()">Scan Networks</button><div id="scanStatus"></div><div id="wifiSection" style="display: none; margin-top: 15px;"><div class="input-group"><label for="wifiNetwork">Select Network:</label><select id="wifiNetwork"></select></div><div class="input-group"><label for="wifiPassword">Password:</label><input type="password" id="wifiPassword" placeholder="Enter WiFi password"></div><button class="button" onclick="connectWiFi()">Connect</button></div><div class="spacer"></div><button class="button" onclick="reconfigureWiFi()">Reconfigure WiFi (Portal)</button></div></div><div class="card"><div class="card-header">Settings</div><div class="card-body"><div class="input-group"><label for="brightness">Brightness (0-100):</label><input type="number" id="brightness" min="0" max="100"><button class="button" onclick="setBrightness()">Set Brightness</button></div><div class="input-group"><label for="gmtOffset">GMT Offset (seconds):</label><input type="number" id="gmtOffset"><button class="button" onclick="setTimezone()">Set Timezone</button></div></div></div><div class="card"><div class="card-header">Image Management</div><div class="card-body"><form action="/doUpload?dir=/image/" method="POST" enctype="multipart/form-data"><div class="input-group"><label for="fileUpload">Upload JPEG Image:</label><input type="file" name="file" accept="image/jpeg" id="fileUpload"><input type="submit" value="Upload" class="button"></div></form><div class="info">Uploaded images are stored on LittleFS and cleared on reboot unless set as default.</div><div class="input-group"><button class="button" onclick="displayTestImage()">Display Test Image</button></div><div class="input-group"><label for="imagePath">Display Image Path (e.g., /image/my_image.jpg):</label><input type="text" id="imagePath"><button class="button" onclick="displayImage()">Display Image</button></div></div></div><div class="card"><div class="card-header">Advanced Actions</div><div class="card-body button-group"><a href="/update" class="button">Firmware Update (OTA)</a><button class="button red" onclick="factoryReset()">Factory Reset</button></div></div></div><script>function setBrightness(){var brightness=document.getElementById("brightness").value;fetch('/set?brt='+brightness).then(response=>response.text()).then(data=>alert('Brightness set: '+data)).catch(error=>console.error('Error:',error));} function reconfigureWiFi(){if (confirm("Are you sure you want to reconfigure WiFi? This will restart the device into AP mode.")){fetch('/reconfigurewifi').then(response=>response.text()).then(data=>alert('WiFi Reconfiguration triggered: '+data)).catch(error=>console.error('Error:',error));}} function setTimezone(){var gmtOffset=document.getElementById("gmtOffset").value;fetch('/set?gmt='+gmtOffset).then(response=>response.text()).then(data=>alert('Timezone set: '+data)).catch(error=>console.error('Error:',error));} function displayImage(){var imagePath=document.getElementById("imagePath").value;fetch('/set?img='+imagePath).then(response=>response.text()).then(data=>alert('Image display triggered: '+data)).catch(error=>console.error('Error:',error));} function displayTestImage(){fetch('/test').then(response=>response.text()).then(data=>alert('Test Image display triggered: '+data)).catch(error=>console.error('Error:',error));} function factoryReset(){if (confirm("WARNING: Are you sure you want to perform a factory reset? This will erase all settings and files and restart the device.")){fetch('/factoryreset').then(response=>response.text()).then(data=>alert('Factory Reset triggered: '+data)).catch(error=>console.error('Error:',error));}} function scanWiFi(){document.getElementById('scanStatus').textContent='Scanning for networks...';document.getElementById('wifiSection').style.display='none';fetch('/scan').then(response=>response.json()).then(data=>{const select=document.getElementById('wifiNetwork');select.innerHTML='<option value="">--Select a network--</option>';if (data.length===0){document.getElementById('scanStatus').textContent='No networks found';return;}data.sort((a,b)=>b.rssi-a.rssi);data.forEach(network=>{if (network.ssid&&network.ssid.trim()!==''){const option=document.createElement('option');option.value=network.ssid;let signalBars='';if (network.rssi>-60) signalBars='++++';else if (network.rssi>-70) signalBars='+++';else if (network.rssi>-80) signalBars='++';else signalBars='+';const encryption=network.encryption===7 ? '[Open]' : '[Secure]';option.textContent=`${network.ssid} ${signalBars} ${encryption}`;select.appendChild(option);}});document.getElementById('scanStatus').textContent=`Found ${data.length} network(s)`;document.getElementById('wifiSection').style.display='block';}).catch(error=>{console.error('Error:',error);document.getElementById('scanStatus').textContent='Scan failed';});} function connectWiFi(){const ssid=document.getElementById('wifiNetwork').value;const password=document.getElementById('wifiPassword').value;if (!ssid){alert('Please select a network');return;} if (confirm(`Connect to ${ssid}? The device will restart if the connection is successful.`)){document.getElementById('scanStatus').textContent='Connecting...';fetch(`/connect?ssid=${encodeURIComponent(ssid)}&password=${encodeURIComponent(password)}`).then(response=>response.text()).then(data=>{alert(data);document.getElementById('scanStatus').textContent='Connection attempt sent. Please wait for device to restart...';}).catch(error=>{console.error('Error:',error);document.getElementById('scanStatus').textContent='Connection failed';});}}window.onload=function(){fetch('/app.json').then(response=>response.json()).then(data=>{document.getElementById('brightness').value=data.brt;document.getElementById('gmtOffset').value=data.gmtOffset;document.getElementById('imagePath').value=data.img;}).catch(error=>console.error('Error fetching app data:',error));fetch('/version.json').then(response=>response.json()).then(data=>{document.getElementById('firmwareVersion').textContent=data.version;}).catch(error=>{console.error('Error fetching version:',error);document.getElementById('firmwareVersion').textContent='Unknown';});};</script></body></html>)rawliteral";
+static const char index_html[] PROGMEM = R"rawliteral(<!DOCTYPE html><html><head><title>SmartClock Control</title><meta name="viewport" content="width=device-width, initial-scale=1"><style>:root{--primary-color:#007bff;--primary-hover-color:#0056b3;--danger-color:#dc3545;--danger-hover-color:#c82333;--background-color:#f8f9fa;--card-bg-color:#ffffff;--border-color:#dee2e6;--text-color:#212529;--light-text-color:#6c757d;--shadow-color:rgba(0,0,0,0.05);--font-family:-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif}body{font-family:var(--font-family);margin:0;padding:20px;background-color:var(--background-color);color:var(--text-color);line-height:1.5}.container{max-width:600px;margin:20px auto;background-color:var(--card-bg-color);border-radius:8px;box-shadow:0 4px 12px var(--shadow-color);overflow:hidden}h1{background-color:var(--primary-color);color:white;padding:15px 20px;margin:0;font-size:1.8em;text-align:center;border-bottom:1px solid var(--primary-hover-color)}.card{background-color:var(--card-bg-color);border:1px solid var(--border-color);border-radius:8px;margin:20px;overflow:hidden;box-shadow:0 2px 5px var(--shadow-color)}.card-header{background-color:#e9ecef;padding:10px 15px;font-size:1.2em;font-weight:bold;color:var(--primary-color);border-bottom:1px solid var(--border-color)}.card-body{padding:15px}.input-group{margin-bottom:15px}.input-group label{display:block;margin-bottom:5px;font-weight:bold;color:var(--text-color)}.input-group input[type="number"],.input-group input[type="text"],.input-group input[type="password"],.input-group select{width:calc(100% - 22px);padding:10px;border:1px solid var(--border-color);border-radius:4px;box-sizing:border-box;font-size:1em;margin-top:3px}.input-group input[type="file"]{margin-top:5px}.button{display:inline-block;background-color:var(--primary-color);color:white;padding:10px 15px;border:none;border-radius:5px;cursor:pointer;text-decoration:none;font-size:1em;margin-top:10px;transition:background-color 0.2s ease}.button:hover{background-color:var(--primary-hover-color)}.button.red{background-color:var(--danger-color)}.button.red:hover{background-color:var(--danger-hover-color)}.button-group{display:flex;flex-wrap:wrap;gap:10px;margin-top:10px}.button-group .button{margin-top:0}.info{background-color:#e0f7fa;color:#006064;border:1px solid #b2ebf2;padding:10px;border-radius:5px;margin-top:15px;font-size:0.9em}.version-info{background-color:#f8f9fa;color:#495057;padding:8px 10px;border-radius:4px;margin-bottom:15px;font-size:0.9em;text-align:center}#scanStatus{margin-top:10px;font-style:italic;color:var(--light-text-color)}form{margin-bottom:0}.spacer{height:10px}</style></head><body><div class="container"><h1>SmartClock Control</h1><div class="card"><div class="card-header">Status & Info</div><div class="card-body"><div class="version-info">Firmware Version: <strong id="firmwareVersion">Loading...</strong></div><div class="button-group"><a href="/app.json" class="button">App JSON</a><a href="/space.json" class="button">Storage Info</a><a href="/brt.json" class="button">Brightness JSON</a><a href="/log" class="button">View Logs</a></div></div></div><div class="card"><div class="card-header">WiFi Configuration</div><div class="card-body"><button class="button" onclick="scanWiFi()">Scan Networks</button><div id="scanStatus"></div><div id="wifiSection" style="display: none; margin-top: 15px;"><div class="input-group"><label for="wifiNetwork">Select Network:</label><select id="wifiNetwork"></select></div><div class="input-group"><label for="wifiPassword">Password:</label><input type="password" id="wifiPassword" placeholder="Enter WiFi password"></div><button class="button" onclick="connectWiFi()">Connect</button></div><div class="spacer"></div><button class="button" onclick="reconfigureWiFi()">Reconfigure WiFi (Portal)</button></div></div><div class="card"><div class="card-header">Settings</div><div class="card-body"><div class="input-group"><label for="brightness">Brightness (0-100):</label><input type="number" id="brightness" min="0" max="100"><button class="button" onclick="setBrightness()">Set Brightness</button></div><div class="input-group"><label for="gmtOffset">GMT Offset (seconds):</label><input type="number" id="gmtOffset"><button class="button" onclick="setTimezone()">Set Timezone</button></div></div></div><div class="card"><div class="card-header">Image Management</div><div class="card-body"><form action="/doUpload?dir=/image/" method="POST" enctype="multipart/form-data"><div class="input-group"><label for="fileUpload">Upload JPEG Image:</label><input type="file" name="file" accept="image/jpeg" id="fileUpload"><input type="submit" value="Upload" class="button"></div></form><div class="info">Uploaded images are stored on LittleFS and cleared on reboot unless set as default.</div><div class="input-group"><button class="button" onclick="displayTestImage()">Display Test Image</button></div><div class="input-group"><label for="imagePath">Display Image Path (e.g., /image/my_image.jpg):</label><input type="text" id="imagePath"><button class="button" onclick="displayImage()">Display Image</button></div></div></div><div class="card"><div class="card-header">Advanced Actions</div><div class="card-body button-group"><a href="/update" class="button">Firmware Update (OTA)</a><button class="button red" onclick="factoryReset()">Factory Reset</button></div></div></div><script>function setBrightness(){var brightness=document.getElementById("brightness").value;fetch('/set?brt='+brightness).then(response=>response.text()).then(data=>alert('Brightness set: '+data)).catch(error=>console.error('Error:',error));} function reconfigureWiFi(){if (confirm("Are you sure you want to reconfigure WiFi? This will restart the device into AP mode.")){fetch('/reconfigurewifi').then(response=>response.text()).then(data=>alert('WiFi Reconfiguration triggered: '+data)).catch(error=>console.error('Error:',error));}} function setTimezone(){var gmtOffset=document.getElementById("gmtOffset").value;fetch('/set?gmt='+gmtOffset).then(response=>response.text()).then(data=>alert('Timezone set: '+data)).catch(error=>console.error('Error:',error));} function displayImage(){var imagePath=document.getElementById("imagePath").value;fetch('/set?img='+imagePath).then(response=>response.text()).then(data=>alert('Image display triggered: '+data)).catch(error=>console.error('Error:',error));} function displayTestImage(){fetch('/test').then(response=>response.text()).then(data=>alert('Test Image display triggered: '+data)).catch(error=>console.error('Error:',error));} function factoryReset(){if (confirm("WARNING: Are you sure you want to perform a factory reset? This will erase all settings and files and restart the device.")){fetch('/factoryreset').then(response=>response.text()).then(data=>alert('Factory Reset triggered: '+data)).catch(error=>console.error('Error:',error));}} function scanWiFi(){document.getElementById('scanStatus').textContent='Scanning for networks...';document.getElementById('wifiSection').style.display='none';fetch('/scan').then(response=>response.json()).then(data=>{const select=document.getElementById('wifiNetwork');select.innerHTML='<option value="">--Select a network--</option>';if (data.length===0){document.getElementById('scanStatus').textContent='No networks found';return;}data.sort((a,b)=>b.rssi-a.rssi);data.forEach(network=>{if (network.ssid&&network.ssid.trim()!==''){const option=document.createElement('option');option.value=network.ssid;let signalBars='';if (network.rssi>-60) signalBars='++++';else if (network.rssi>-70) signalBars='+++';else if (network.rssi>-80) signalBars='++';else signalBars='+';const encryption=network.encryption===7 ? '[Open]' : '[Secure]';option.textContent=`${network.ssid} ${signalBars} ${encryption}`;select.appendChild(option);}});document.getElementById('scanStatus').textContent=`Found ${data.length} network(s)`;document.getElementById('wifiSection').style.display='block';}).catch(error=>{console.error('Error:',error);document.getElementById('scanStatus').textContent='Scan failed';});} function connectWiFi(){const ssid=document.getElementById('wifiNetwork').value;const password=document.getElementById('wifiPassword').value;if (!ssid){alert('Please select a network');return;} if (confirm(`Connect to ${ssid}? The device will restart if the connection is successful.`)){document.getElementById('scanStatus').textContent='Connecting...';fetch(`/connect?ssid=${encodeURIComponent(ssid)}&password=${encodeURIComponent(password)}`).then(response=>response.text()).then(data=>{alert(data);document.getElementById('scanStatus').textContent='Connection attempt sent. Please wait for device to restart...';}).catch(error=>{console.error('Error:',error);document.getElementById('scanStatus').textContent='Connection failed';});}}window.onload=function(){fetch('/app.json').then(response=>response.json()).then(data=>{document.getElementById('brightness').value=data.brt;document.getElementById('gmtOffset').value=data.gmtOffset;document.getElementById('imagePath').value=data.img;}).catch(error=>console.error('Error fetching app data:',error));fetch('/version.json').then(response=>response.json()).then(data=>{document.getElementById('firmwareVersion').textContent=data.version;}).catch(error=>{console.error('Error fetching version:',error);document.getElementById('firmwareVersion').textContent='Unknown';});};</script></body></html>)rawliteral";
 
 void handleAppJson() {
-    String json = "{";
-    json += "\"theme\":" + String(currentTheme) + ",";
-    json += "\"brt\":" + String(currentBrightness) + ",";
-    json += "\"img\":\"";
-    json += currentImage;
-    json += "\",";
-    json += "\"gmtOffset\":" + String(appSettings.gmtOffset);
-    json += "}";
+    char json[160];
+    snprintf(json, sizeof(json), "{\"theme\":%d,\"brt\":%d,\"img\":\"%s\",\"gmtOffset\":%ld}",
+             currentTheme, currentBrightness, currentImage, appSettings.gmtOffset);
     server.send(200, "application/json", json);
 }
 
@@ -38,63 +33,97 @@ void handleSpaceJson() {
     FSInfo fs_info;
     LittleFS.info(fs_info);
 
-    String json = "{";
-    json += "\"total\":" + String(fs_info.totalBytes) + ",";
-    json += "\"free\":" + String(fs_info.totalBytes - fs_info.usedBytes);
-    json += "}";
+    char json[64];
+    snprintf(json, sizeof(json), "{\"total\":%lu,\"free\":%lu}",
+             (unsigned long)fs_info.totalBytes, (unsigned long)(fs_info.totalBytes - fs_info.usedBytes));
     server.send(200, "application/json", json);
 }
 
 void handleBrtJson() {
-    String json = "{\"brt\":\"" + String(currentBrightness) + "\"}";
+    char json[32];
+    snprintf(json, sizeof(json), "{\"brt\":\"%d\"}", currentBrightness);
     server.send(200, "application/json", json);
 }
 
 void handleVersionJson() {
-    String json = "{\"version\":\"" + String(FIRMWARE_VERSION_STRING) + "\"}";
-    server.send(200, "application/json", json);
+    // Version is fixed at build time, so the response is a compile-time constant
+    static const char versionJson[] = "{\"version\":\"" FIRMWARE_VERSION_STRING "\"}";
+    server.send(200, "application/json", versionJson);
 }
 
 void handleSet() {
     bool updated = false;
+    bool settingsChanged = false;
+
+    // Collect the arguments in a single pass over the query; the first
+    // occurrence of a key wins, as with hasArg()/arg()
+    const String *brtArg = nullptr;
+    const String *themeArg = nullptr;
+    const String *imgArg = nullptr;
+    const String *gmtArg = nullptr;
+    const String *clearArg = nullptr;
+    for (int i = 0; i < server.args(); i++) {
+        const String &name = server.argName(i);
+        if (name == "brt" && brtArg == nullptr) {
+            brtArg = &server.arg(i);
+        } else if (name == "theme" && themeArg == nullptr) {
+            themeArg = &server.arg(i);
+        } else if (name == "img" && imgArg == nullptr) {
+            imgArg = &server.arg(i);
+        } else if (name == "gmt" && gmtArg == nullptr) {
+            gmtArg = &server.arg(i);
+        } else if (name == "clear" && clearArg == nullptr) {
+            clearArg = &server.arg(i);
+        }
+    }
 
-    if (server.hasArg("brt")) {
-        currentBrightness = server.arg("brt").toInt();
+    // Apply them in a fixed order, independent of the query order
+    if (brtArg != nullptr) {
+        currentBrightness = brtArg->toInt();
         currentBrightness = constrain(currentBrightness, 0, 100);
         displaySetBrightness(currentBrightness);
-        appSettings.brightness = currentBrightness;
-        settingsSave(appSettings);
+        if (appSettings.brightness != currentBrightness) {
+            appSettings.brightness = currentBrightness;
+            settingsChanged = true;
+        }
         updated = true;
     }
 
-    if (server.hasArg("theme")) {
-        currentTheme = server.arg("theme").toInt();
-        appSettings.theme = currentTheme;
-        settingsSave(appSettings);
+    if (themeArg != nullptr) {
+        currentTheme = themeArg->toInt();
+        if (appSettings.theme != currentTheme) {
+            appSettings.theme = currentTheme;
+            settingsChanged = true;
+        }
         updated = true;
     }
 
-    if (server.hasArg("img")) {
-        strncpy(currentImage, server.arg("img").c_str(), sizeof(currentImage));
+    if (imgArg != nullptr) {
+        strncpy(currentImage, imgArg->c_str(), sizeof(currentImage));
         currentImage[sizeof(currentImage) - 1] = '\0'; // Ensure null-termination
         strncpy(displayState.imagePath, currentImage, sizeof(displayState.imagePath));
         displayState.imagePath[sizeof(displayState.imagePath) - 1] = '\0'; // Ensure null-termination
         displayState.showImage = true;
         displayUpdate();
-        strncpy(appSettings.lastImage, currentImage, sizeof(appSettings.lastImage)); // Use sizeof for appSettings.lastImage
-        settingsSave(appSettings);
+        if (strcmp(appSettings.lastImage, currentImage) != 0) {
+            strncpy(appSettings.lastImage, currentImage, sizeof(appSettings.lastImage)); // Use sizeof for appSettings.lastImage
+            settingsChanged = true;
+        }
         updated = true;
     }
 
-    if (server.hasArg("gmt")) {
-        appSettings.gmtOffset = server.arg("gmt").toInt();
-        timeClient.setTimeOffset(appSettings.gmtOffset);
-        settingsSave(appSettings);
+    if (gmtArg != nullptr) {
+        long gmtOffset = gmtArg->toInt();
+        if (appSettings.gmtOffset != gmtOffset) {
+            appSettings.gmtOffset = gmtOffset;
+            timeClient.setTimeOffset(appSettings.gmtOffset);
+            settingsChanged = true;
+        }
         updated = true;
     }
 
-    if (server.hasArg("clear")) {
-        if (server.arg("clear") == "image") {
+    if (clearArg != nullptr) {
+        if (*clearArg == "image") {
             Dir dir = LittleFS.openDir(IMAGE_DIR);
             while (dir.next()) {
                 LittleFS.remove(dir.fileName());
@@ -103,22 +132,29 @@ void handleSet() {
         }
     }
 
+    // Persist once per request, and only if a stored value actually changed
+    if (settingsChanged) {
+        settingsSave(appSettings);
+    }
+
     server.send(200, "text/plain", updated ? "OK" : "No action");
 }
 
+// Upload target: ?dir= (IMAGE_DIR if absent) followed by the uploaded file name
+static String uploadPath(const String &filename) {
+    const String &dir = server.arg("dir"); // Single lookup, empty if not given
+    String filepath = dir.isEmpty() ? String(IMAGE_DIR) : dir;
+    filepath += filename;
+    return filepath;
+}
+
 void handleFileUpload() {
     HTTPUpload& upload = server.upload();
 
     if (upload.status == UPLOAD_FILE_START) {
-        String filename = upload.filename;
-        Serial.printf("Upload start: %s\n", filename.c_str());
-
-        String dir = IMAGE_DIR;
-        if (server.hasArg("dir")) {
-            dir = server.arg("dir");
-        }
+        Serial.printf("Upload start: %s\n", upload.filename.c_str());
 
-        String filepath = dir + filename;
+        String filepath = uploadPath(upload.filename);
         uploadFile = LittleFS.open(filepath, "w");
 
         if (!uploadFile) {
@@ -132,8 +168,6 @@ void handleFileUpload() {
             size_t bytesWritten = uploadFile.write(upload.buf, upload.currentSize);
             if (bytesWritten != upload.currentSize) {
                 logPrintf("WARNING: Only %u of %u bytes written to file!", bytesWritten, upload.currentSize);
-            } else {
-                logPrintf("INFO: Wrote %u bytes to file.", bytesWritten);
             }
         }
     } else if (upload.status == UPLOAD_FILE_END) {
@@ -150,12 +184,7 @@ void handleUploadDone() {
     server.send(200, "text/plain", "OK");
 
     // After upload, verify file size on LittleFS
-    String filename = server.upload().filename;
-    String dir = IMAGE_DIR;
-    if (server.hasArg("dir")) {
-        dir = server.arg("dir");
-    }
-    String filepath = dir + filename;
+    String filepath = uploadPath(server.upload().filename);
 
     File uploadedFile = LittleFS.open(filepath, "r");
     if (uploadedFile) {
@@ -181,13 +210,14 @@ void handleDelete() {
 
 void handleApiUpdate() {
     if (server.hasArg("plain")) {
-        String body = server.arg("plain");
+        const String &body = server.arg("plain");
         JsonDocument doc;
         deserializeJson(doc, body);
 
         // line1 from API now goes to displayState.line2 for custom messages
-        if (!doc["line1"].isNull()) {
-            strncpy(displayState.line2, doc["line1"].as<const char*>(), sizeof(displayState.line2));
+        const char *line1 = doc["line1"]; // Looked up once; null if missing or not a string
+        if (line1 != nullptr) {
+            strncpy(displayState.line2, line1, sizeof(displayState.line2));
             displayState.line2[sizeof(displayState.line2) - 1] = '\0'; // Ensure null-termination
         } else {
             // If line1 is not provided, clear the custom message
@@ -269,14 +299,17 @@ void handleFactoryReset() {
     ESP.restart(); // Restart the device
 }
 
+// Kept in flash; a plain string literal would occupy RAM for the whole uptime
+static const char ota_html[] PROGMEM =
+    "<!DOCTYPE html><html><body>"
+    "<h1>SmartClock OTA Update</h1>"
+    "<form method='POST' action='/update' enctype='multipart/form-data'>"
+    "<input type='file' name='update'><br><br>"
+    "<input type='submit' value='Update Firmware'>"
+    "</form></body></html>";
+
 void handleOTAForm() {
-    server.send(200, "text/html",
-        "<!DOCTYPE html><html><body>"
-        "<h1>SmartClock OTA Update</h1>"
-        "<form method='POST' action='/update' enctype='multipart/form-data'>"
-        "<input type='file' name='update'><br><br>"
-        "<input type='submit' value='Update Firmware'>"
-        "</form></body></html>");
+    server.send_P(200, "text/html", ota_html);
 }
 
 void handleOTAUpload() {
@@ -398,7 +431,7 @@ void handleWiFiConnect() {
 }
 
 void handleRoot() {
-    server.send(200, "text/html", index_html);
+    server.send_P(200, "text/html", index_html);
 }
 
 void webserverInit() {